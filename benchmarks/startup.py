@@ -0,0 +1,59 @@
+""" Measure posh-to-dash startup time and the import cost of every pipeline stage """
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+root_dir = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+# command lines, relative to the repository root
+commands = {
+    '--help' : [sys.executable, "posh-to-dash.py", "--help"],
+    'import posh_to_dash' : [sys.executable, "-c", "import posh_to_dash"],
+    'import posh_to_dash.cli' : [sys.executable, "-c", "import posh_to_dash.cli"],
+    'import posh_to_dash.lookup' : [sys.executable, "-c", "import posh_to_dash.lookup"],
+    'import posh_to_dash.delta' : [sys.executable, "-c", "import posh_to_dash.delta"],
+    'import posh_to_dash.index' : [sys.executable, "-c", "import posh_to_dash.index"],
+    'import posh_to_dash.package' : [sys.executable, "-c", "import posh_to_dash.package"],
+    'import posh_to_dash.crawl' : [sys.executable, "-c", "import posh_to_dash.crawl"],
+    'import posh_to_dash.rewrite' : [sys.executable, "-c", "import posh_to_dash.rewrite"],
+    'import posh_to_dash.resources' : [sys.executable, "-c", "import posh_to_dash.resources"],
+    'import posh_to_dash.webdriver' : [sys.executable, "-c", "import posh_to_dash.webdriver"],
+    'import posh_to_dash.build' : [sys.executable, "-c", "import posh_to_dash.build"],
+}
+
+def time_command(command : list, repeat : int):
+    """ Run a command several times, returning every wall clock duration in seconds """
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=root_dir, check=True, stdout=subprocess.DEVNULL)
+        durations.append(time.perf_counter() - start)
+
+    return durations
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(
+        description='Measure posh-to-dash startup time and per-stage import cost'
+    )
+
+    parser.add_argument("-r", "--repeat",
+        help="number of runs per command",
+        default = 10,
+        type=int
+    )
+
+    args = parser.parse_args()
+
+    baseline = statistics.median(time_command([sys.executable, "-c", "pass"], args.repeat))
+    print("%-32s median %7.1f ms" % ("python interpreter", baseline * 1000))
+
+    for name, command in commands.items():
+        median = statistics.median(time_command(command, args.repeat))
+        print("%-32s median %7.1f ms (+%.1f ms)" % (name, median * 1000, (median - baseline) * 1000))
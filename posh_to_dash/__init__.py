@@ -0,0 +1,16 @@
+"""
+Dash docset creation for Powershell modules and Cmdlets.
+
+Every pipeline stage lives in its own module and only imports the heavy
+dependencies it needs :
+
+    crawl      1. Download html pages (requests)
+    rewrite    2. Parse and rewrite html contents (bs4)
+    resources  3. Download additionnal resources (requests, bs4, selenium)
+    index      4. Database indexing
+    package    5. Archive packaging
+
+along with the delta and lookup modules working on already built docsets.
+"""
+
+from .configuration import Configuration
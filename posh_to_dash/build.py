@@ -0,0 +1,128 @@
+""" Full docset creation pipeline """
+
+import os
+import json
+import shutil
+import logging
+
+from .configuration import Configuration
+from .folders import copy_folder, merge_folders
+from .cache import load_local_contents, load_cached_resources, save_cached_resources, copy_cached_resources
+from .rewrite import rewrite_html_contents
+from .index import create_sqlite_database, create_fulltext_index
+from .package import make_docset
+
+
+def build_docset(configuration : Configuration):
+
+    # """ Scheme for content toc : 
+    # {
+    #     module_name : {
+    #         'name' : str,
+    #         'index' : relative path,
+    #         'cmdlets' : [
+    #             {
+    #                 'name' : str,
+    #                 'path' : relative path, 
+    #             },
+    #             ...
+    #         ]
+    #     },
+    #     ...
+    # }
+    # """
+    content_toc = {}
+    resources_to_dl = set()
+
+    """ 0. Prepare folders """
+    download_dir = os.path.join(configuration.build_folder, "_1_downloaded_contents")
+    win10_download_dir = os.path.join(os.getcwd(), "_win10_downloaded_contents")
+    resources_cache_dir = os.path.join(configuration.build_folder, "_1_downloaded_resources")
+    html_rewrite_dir = os.path.join(configuration.build_folder, "_2_html_rewrite")
+    additional_resources_dir = os.path.join(configuration.build_folder, "_3_additional_resources")
+    package_dir = os.path.join(configuration.build_folder, "_4_ready_to_be_packaged")
+
+    for folder in [download_dir, resources_cache_dir, html_rewrite_dir, additional_resources_dir, package_dir]:
+        os.makedirs(folder, exist_ok=True)
+
+    # _4_ready_to_be_packaged is the final build dir
+    docset_dir = os.path.join(package_dir, "%s.docset" % Configuration.docset_name)
+    content_dir = os.path.join(docset_dir , "Contents")
+    resources_dir = os.path.join(content_dir, "Resources")
+    document_dir = os.path.join(resources_dir, "Documents")
+
+    # start the webdriver right away, so a missing or broken browser is not only found after the crawl
+    if not configuration.local:
+        _ = configuration.webdriver
+
+    """ 1. Download html pages """
+    if configuration.local:
+        # reuse the contents (win10 api included) and toc saved by a previous build
+        logging.info("[1] loading local contents")
+        content_toc = load_local_contents(configuration, download_dir, resources_cache_dir, [additional_resources_dir, document_dir])
+
+    else:
+        from .crawl import crawl_posh_contents
+
+        logging.info("[1] scraping web contents")
+        content_toc = crawl_posh_contents(configuration, configuration.docs_toc_url, download_dir)
+
+        # do not download twice the win10 api since it's quite a handful
+        if os.path.exists(os.path.join(win10_download_dir, "toc.json")):
+            with open(os.path.join(win10_download_dir, "toc.json"), "r") as content:
+                windows_toc = json.load(content)
+        else:
+            windows_toc = crawl_posh_contents(configuration, configuration.windows_toc_url, win10_download_dir)
+            with open(os.path.join(win10_download_dir, "toc.json"), "w") as content:
+                    json.dump(windows_toc, content)
+            
+        # Merge win10 api content
+        merge_folders(win10_download_dir, download_dir)
+        content_toc.update(windows_toc)
+        with open(os.path.join(download_dir, "toc.json"), "w") as content:
+            json.dump(content_toc, content)
+
+    """ 2.  Parse and rewrite html contents """
+    logging.info("[2] rewriting urls and hrefs")
+    copy_folder(download_dir, html_rewrite_dir)
+    resources_to_dl, pages_text = rewrite_html_contents(configuration, html_rewrite_dir)
+
+    """ 3.  Download additionnal resources """
+    copy_folder(html_rewrite_dir, additional_resources_dir )
+
+    if configuration.local:
+        logging.info("[3] copy cached style contents")
+        resources = set(load_cached_resources(resources_cache_dir))
+        resources.update(resource.path for resource in resources_to_dl)
+        copy_cached_resources(resources_cache_dir, additional_resources_dir, resources)
+
+    else:
+        from .resources import download_additional_resources
+
+        logging.info("[3] download style contents")
+        download_additional_resources(configuration, additional_resources_dir, resources_to_dl)
+
+        # keep the downloaded resources for --local rebuilds
+        save_cached_resources(additional_resources_dir, html_rewrite_dir, resources_cache_dir)
+
+    """ 4.  Database indexing """
+    logging.info("[4] indexing to database")
+    copy_folder(additional_resources_dir, document_dir )
+    create_sqlite_database(configuration, content_toc, resources_dir, document_dir)
+    create_fulltext_index(os.path.join(resources_dir, "docSet.dsidx"), pages_text)
+
+    """ 5.  Archive packaging """
+    shutil.copy("static/Info.plist", content_dir)
+    shutil.copy("static/DASH_LICENSE", os.path.join(resources_dir, "LICENSE"))
+    shutil.copy("static/icon.png", docset_dir)
+    shutil.copy("static/icon@2x.png", docset_dir)
+
+    output_dir = os.path.dirname(configuration.output_filepath)
+    os.makedirs(output_dir, exist_ok=True)
+
+    logging.info("[5] packaging as a dash docset")
+    make_docset(
+        docset_dir,
+        configuration.output_filepath,
+        Configuration.docset_name
+    )
@@ -0,0 +1,171 @@
+""" Local cache of downloaded contents, used by --local to rebuild a docset without network access """
+
+import os
+import re
+import gzip
+import json
+import shutil
+import logging
+
+from .configuration import Configuration
+
+
+class MissingLocalContents(ValueError):
+    """ Some files needed by a --local rebuild are not present in the local cache """
+
+    def __init__(self, missing : list):
+        self.missing = missing
+        super().__init__("%d files missing from the local cache (run a build without --local first) :\n%s" % (
+            len(missing), "\n".join("  %s" % path for path in missing)
+        ))
+
+
+def list_missing_files(root_dir : str, paths, compressed : bool = False):
+    """
+    Return the sorted full paths of the relative paths which do not exist under root_dir.
+    If compressed is set, a gzip-compressed "path.gz" file is also accepted.
+    """
+
+    def is_missing(filepath):
+        if os.path.isfile(filepath):
+            return False
+        return not (compressed and os.path.isfile(filepath + ".gz"))
+
+    filepaths = (os.path.join(root_dir, path) for path in paths)
+    return sorted(filepath for filepath in filepaths if is_missing(filepath))
+
+def list_theme_resources(download_dir : str, pages):
+    """
+    Return the relative paths of the theme stylesheets linked by the pages head, as
+    rewrite_soup will find them, by scanning the raw html instead of parsing it.
+    """
+
+    link_pattern = re.compile(r"<link\b[^>]*>", re.IGNORECASE)
+    href_pattern = re.compile(r"href\s*=\s*[\"']([^\"']+)[\"']", re.IGNORECASE)
+    stylesheet_pattern = re.compile(r"rel\s*=\s*[\"']?stylesheet", re.IGNORECASE)
+
+    resources = set()
+    for page in pages:
+
+        filepath = os.path.join(download_dir, page)
+        if os.path.isfile(filepath):
+            page_fd = open(filepath, 'r', encoding='utf8')
+        else:
+            page_fd = gzip.open(filepath + ".gz", 'rt', encoding='utf8')
+
+        # only read up to the end of the head
+        head = []
+        with page_fd:
+            for line in page_fd:
+                head.append(line)
+                if "</head>" in line.lower():
+                    break
+
+        for link in link_pattern.findall("".join(head)):
+            href = href_pattern.search(link)
+            if not href or not stylesheet_pattern.search(link):
+                continue
+
+            uri_path = href.group(1).strip().lstrip('/')
+            if uri_path.startswith(Configuration.default_theme_uri):
+                resources.add(os.path.join(Configuration.domain, uri_path))
+
+    return resources
+
+def load_local_contents(configuration, download_dir : str, resources_cache_dir : str, previous_documents_dirs : list = []):
+    """
+    Load the content toc saved by a previous build, checking every page it references
+    and every cached additional resource is available locally.
+    Build folders older than the resources cache are seeded from the first of
+    previous_documents_dirs holding the resources of a previous build.
+    """
+
+    toc_filepath = os.path.join(download_dir, "toc.json")
+    if not os.path.exists(toc_filepath):
+        raise MissingLocalContents([toc_filepath])
+
+    with open(toc_filepath, "r") as content:
+        content_toc = json.load(content)
+
+    # optional filter on selected module
+    if len(configuration.filter_modules):
+        content_toc = {
+            module_name : module for module_name, module in content_toc.items()
+            if module_name.lower() in configuration.filter_modules
+        }
+        logging.debug("filtered modules : %s" % list(content_toc.keys()))
+
+    pages = []
+    for module_name, module in content_toc.items():
+
+        # toc saved before modules without index page were recorded as such
+        if module['index'] is not None and len(list_missing_files(download_dir, [module['index']], compressed = True)):
+            logging.warning("module %s has no index page, skipping it" % module_name)
+            module['index'] = None
+
+        if module['index'] is not None:
+            pages.append(module['index'])
+        pages.extend(cmdlet['path'] for cmdlet in module['cmdlets'])
+
+    missing = list_missing_files(download_dir, pages, compressed = True)
+
+    resources_filepath = os.path.join(resources_cache_dir, "resources.json")
+    if not os.path.exists(resources_filepath):
+        for documents_dir in previous_documents_dirs:
+
+            # the start page is only written by the resources stage
+            if os.path.isfile(os.path.join(documents_dir, Configuration.domain, "en-us", "index.html")):
+                logging.info("seeding the resources cache from %s" % documents_dir)
+                save_cached_resources(documents_dir, download_dir, resources_cache_dir)
+                break
+
+    if os.path.exists(resources_filepath):
+        resources = set(load_cached_resources(resources_cache_dir))
+        if not len(missing):
+            resources.update(list_theme_resources(download_dir, pages))
+
+        missing.extend(list_missing_files(resources_cache_dir, resources))
+    else:
+        missing.append(resources_filepath)
+
+    if len(missing):
+        raise MissingLocalContents(missing)
+
+    return content_toc
+
+def load_cached_resources(resources_cache_dir : str):
+    """ Return the relative paths of the additional resources stored in the cache """
+
+    with open(os.path.join(resources_cache_dir, "resources.json"), "r") as content:
+        return json.load(content)
+
+def save_cached_resources(documents_dir : str, html_dir : str, resources_cache_dir : str):
+    """ Store every file added to documents_dir on top of html_dir (i.e. downloaded additional resources) """
+
+    resources = []
+    for root, _, filenames in os.walk(documents_dir):
+        for filename in filenames:
+
+            relpath = os.path.relpath(os.path.join(root, filename), documents_dir)
+            if len(list_missing_files(html_dir, [relpath], compressed = True)) == 0:
+                continue
+
+            resources.append(relpath)
+
+    copy_cached_resources(documents_dir, resources_cache_dir, resources)
+    with open(os.path.join(resources_cache_dir, "resources.json"), "w") as content:
+        json.dump(sorted(resources), content)
+
+def copy_cached_resources(src_dir : str, dst_dir : str, resources):
+    """ Copy additional resources (relative paths) between a documents folder and the cache """
+
+    missing = list_missing_files(src_dir, resources)
+    if len(missing):
+        raise MissingLocalContents(missing)
+
+    for path in resources:
+        logging.debug("copy resource : %s" % path)
+
+        dst_filepath = os.path.join(dst_dir, path)
+        os.makedirs(os.path.dirname(dst_filepath), exist_ok = True)
+        shutil.copyfile(os.path.join(src_dir, path), dst_filepath)
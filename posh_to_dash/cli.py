@@ -0,0 +1,199 @@
+""" Command line interface. Stages modules are imported lazily, so commands only load what they use """
+
+import os
+import json
+import logging
+import argparse
+import tempfile
+
+from .configuration import Configuration
+from .cache import MissingLocalContents
+
+
+def create_parser():
+    """ Command line arguments parser """
+
+    parser = argparse.ArgumentParser(
+        description='Dash docset creation script for Powershell modules and Cmdlets'
+    )
+
+    parser.add_argument("-vv", "--verbose", 
+        help="increase output verbosity", 
+        action="store_true"
+    )
+
+    parser.add_argument("-v", "--version", 
+        help="select powershell API versions", 
+        default = "6",
+        choices = ["3.0", "4.0", "5.0", "5.1", "6"]
+    )
+
+    parser.add_argument("-t", "--temporary", 
+        help="Use a temporary directory for creating docset, otherwise use current dir.", 
+        default=False, 
+        action="store_true"
+    )
+
+    parser.add_argument("-l", "--local", 
+        help="Do not download content, rebuild the docset from a previous build contents. Only for development use.\n" + 
+             "Incompatible with --temporary option", 
+        default=False, 
+        action="store_true"
+    )
+
+    parser.add_argument("-z", "--compress", 
+        help="Store downloaded pages gzip-compressed, in order to shrink the downloaded contents cache.", 
+        default=False, 
+        action="store_true"
+    )
+
+    parser.add_argument("-o", "--output", 
+        help="set output filepath", 
+        default = os.path.join(os.getcwd(), "Powershell.tgz"),
+    )
+
+    parser.add_argument("-p", "--phantom", 
+        help="path to phantomjs executable", 
+        default = None,
+    )
+
+    parser.add_argument("-m", "--modules", 
+        help="filter on selected modules", 
+        default = [],
+        type=str,
+        nargs='+'
+    )
+
+    # Optional commands working on already built docsets.
+    # Without a command, the script scrapes and creates the docset.
+    subparsers = parser.add_subparsers(dest="command")
+
+    manifest_parser = subparsers.add_parser("manifest",
+        help="write the files checksums and index records of a built docset as json"
+    )
+    manifest_parser.add_argument("docset", help="path to the Powershell.docset folder")
+    manifest_parser.add_argument("manifest", help="output manifest filepath")
+
+    delta_parser = subparsers.add_parser("delta",
+        help="create a delta update archive between two built docsets"
+    )
+    delta_parser.add_argument("old", help="path to the previous Powershell.docset folder, or to its json manifest")
+    delta_parser.add_argument("new", help="path to the new Powershell.docset folder")
+    delta_parser.add_argument("delta", help="output delta archive filepath")
+
+    apply_delta_parser = subparsers.add_parser("apply-delta",
+        help="rebuild the new docset from the previous one and a delta archive"
+    )
+    apply_delta_parser.add_argument("old", help="path to the previous Powershell.docset folder")
+    apply_delta_parser.add_argument("delta", help="delta archive filepath")
+    apply_delta_parser.add_argument("new", help="output Powershell.docset folder")
+
+    lookup_parser = subparsers.add_parser("lookup",
+        help="search modules and cmdlets in a built docset"
+    )
+    lookup_parser.add_argument("docset", help="path to the Powershell.docset folder, its docSet.dsidx or a Powershell.tgz archive")
+    lookup_parser.add_argument("query", help="module or cmdlet name to look for")
+    lookup_parser.add_argument("--mode",
+        help="lookup mode",
+        default = "prefix",
+        choices = ["prefix", "substring", "fuzzy", "fulltext"]
+    )
+    lookup_parser.add_argument("--type",
+        help="only return modules or cmdlets",
+        default = None,
+        choices = ["Module", "Command"]
+    )
+    lookup_parser.add_argument("--limit",
+        help="maximum number of results",
+        default = 20,
+        type=int
+    )
+
+    lookup_benchmark_parser = subparsers.add_parser("lookup-benchmark",
+        help="measure the index load time and typical queries latencies of lookup"
+    )
+    lookup_benchmark_parser.add_argument("docset", help="path to the Powershell.docset folder, its docSet.dsidx or a Powershell.tgz archive")
+
+    return parser
+
+
+def main(argv = None):
+    """ Command line entry point """
+
+    parser = create_parser()
+
+    args = parser.parse_args(argv)
+    if args.verbose:
+        logging.basicConfig(level=logging.DEBUG)
+        logging.getLogger("requests").setLevel(logging.WARNING)
+        logging.getLogger("urllib3").setLevel(logging.WARNING)
+    else:
+        logging.basicConfig(level=logging.INFO)
+
+    try:
+        if args.command == "manifest":
+            from .delta import create_docset_manifest
+            with open(args.manifest, "w") as content:
+                json.dump(create_docset_manifest(args.docset), content)
+            return 0
+
+        if args.command == "delta":
+            from .delta import make_docset_delta
+            make_docset_delta(args.old, args.new, args.delta)
+            return 0
+
+        if args.command == "apply-delta":
+            from .delta import apply_docset_delta
+            apply_docset_delta(args.old, args.delta, args.new)
+            return 0
+
+        if args.command == "lookup":
+            from .lookup import DocsetLookup
+            lookup = DocsetLookup.open(args.docset)
+            try:
+                for record in lookup.search(args.query, mode = args.mode, record_type = args.type, limit = args.limit):
+                    if args.mode == "fulltext":
+                        print("%s\t%s\t%s\t%s" % (record.name, record.type, record.path, record.snippet))
+                    else:
+                        print("%s\t%s\t%s" % (record.name, record.type, record.path))
+            finally:
+                lookup.close()
+            return 0
+
+        if args.command == "lookup-benchmark":
+            from .lookup import benchmark, benchmark_queries
+            results = benchmark(args.docset)
+            print("%d records loaded in %.2f ms" % (results['records'], results['load'] * 1000))
+            for mode in benchmark_queries:
+                if mode in results:
+                    print("%-10s median %.3f ms, max %.3f ms, %.0f queries/s" % (
+                        mode, results[mode]['median'] * 1000, results[mode]['max'] * 1000, results[mode]['throughput']
+                    ))
+            return 0
+
+    except ValueError as e:
+        logging.error(e)
+        return 1
+
+    if args.local and args.temporary:
+        parser.error("--local is incompatible with --temporary")
+
+    # Only the full docset creation needs selenium, requests and bs4
+    from .build import build_docset
+
+    conf = Configuration( args )
+
+    try:
+        if args.temporary:
+
+            with tempfile.TemporaryDirectory() as tmp_builddir:
+                conf.build_folder = tmp_builddir
+                build_docset(conf)
+        else:
+            build_docset(conf)
+
+    except MissingLocalContents as e:
+        logging.error(e)
+        return 1
+
+    return 0
@@ -0,0 +1,68 @@
+import os
+
+
+class Configuration:
+
+    # STATIC CONSTANTS
+    posh_doc_api_version = '0.2' # powershell doc api version, not this docset one.
+    posh_version = '6'
+    docset_name = 'Powershell'
+    docset_index_path = 'Contents/Resources/docSet.dsidx' # relative to the .docset folder
+    delta_format_version = 1
+
+    domain = "docs.microsoft.com"
+    base_url = "%s/en-us/powershell/module" % domain
+    default_url = "https://%s/?view=powershell-%%s" % (base_url)
+    default_theme_uri = "_themes/docs.theme/master/en-us/_themes"
+    
+    def __init__(self, args):
+
+        
+        # selected powershell api version
+        self.powershell_version = args.version
+
+        # The modules and cmdlets pages are "versionned" using additional params in the GET request
+        self.powershell_version_param = "view=powershell-{0:s}".format(self.powershell_version)
+
+        # build folder (must be cleaned afterwards)
+        self.build_folder = os.path.join(os.getcwd(), "_build_{0:s}".format(self.powershell_version))
+
+        # output file
+        self.output_filepath = os.path.realpath(args.output)
+
+        # powershell docs start page
+        self.docs_index_url = Configuration.default_url % self.powershell_version
+
+        # powershell docs table of contents url
+        self.docs_toc_url =  "https://{0:s}/psdocs/toc.json?{2:s}".format(
+            Configuration.base_url, 
+            self.powershell_version,
+            self.powershell_version_param
+        )
+
+        self.windows_toc_url = "https://{0:s}/win10-ps/toc.json?view=win10-ps".format(
+            Configuration.base_url
+        )
+
+        # selenium webdriver, only started when a stage actually needs it
+        self.phantom_path = args.phantom
+        self._webdriver = None
+
+        # rebuild from previously downloaded contents, without any network access
+        self.local = args.local
+
+        # store downloaded pages gzip-compressed ("page.html.gz")
+        self.compress_pages = args.compress
+
+        # selected module
+        self.filter_modules = [module.lower() for module in args.modules]
+
+    @property
+    def webdriver(self):
+        """ Lazily start the selenium webdriver, importing selenium on first use """
+
+        if self._webdriver is None:
+            from .webdriver import PoshWebDriver
+            self._webdriver = PoshWebDriver(self.phantom_path)
+
+        return self._webdriver
@@ -0,0 +1,92 @@
+""" 1. Download html pages """
+
+import os
+import json
+import logging
+import urllib.parse
+
+import requests
+
+from .configuration import Configuration
+from .download import download_textfile
+
+
+def download_page_contents(configuration, uri, output_filepath):
+    """ Download a page using it's uri from the TOC """
+
+    # Resolving "absolute" url et use appropriate version
+    full_url = urllib.parse.urljoin(configuration.docs_toc_url, uri)
+    versionned_url = "{0:s}?{1:s}".format(full_url, configuration.powershell_version_param) 
+
+    download_textfile(versionned_url, output_filepath, compress = configuration.compress_pages)
+    
+
+def download_module_contents(configuration, module_name, module_uri, module_dir, cmdlets, root_dir):
+    """ Download a modules contents """
+    
+    module_filepath = os.path.join(module_dir, "%s.html" % module_name)
+
+    logging.debug("downloading %s module index page  -> %s" % (module_name, module_filepath))
+    if module_uri:
+        download_page_contents(configuration, module_uri, module_filepath)
+
+    cmdlets_infos = []
+
+    # Downloading cmdlet contents
+    for cmdlet in cmdlets:
+
+        cmdlet_name = cmdlet['toc_title']
+        if cmdlet_name.lower() in ("about", "functions", "providers", "provider"): # skip special toc
+            continue
+
+        cmdlet_uri = cmdlet["href"]
+        cmdlet_filepath = os.path.join(module_dir, "%s.html" % cmdlet_name)
+
+        logging.debug("downloading %s cmdlet doc -> %s" % (cmdlet_name, cmdlet_filepath))
+        download_page_contents(configuration, cmdlet_uri, cmdlet_filepath)
+
+        cmdlets_infos.append({
+            'name' : cmdlet_name,
+            'path' : os.path.relpath(cmdlet_filepath, root_dir),
+        })
+
+    module_infos = {
+        'name' : module_name,
+        'index' : os.path.relpath(module_filepath, root_dir) if module_uri else None, # no index page for this module
+        'cmdlets' : cmdlets_infos
+    }
+
+    return module_infos
+
+def crawl_posh_contents(configuration: Configuration, toc_url : str, download_dir : str, ):
+    """ Download Powershell modules and cmdlets content pages based on TOC """
+
+    # Download toc
+    logging.debug("Downloading powershell toc : %s" % (toc_url))
+    r = requests.get(toc_url)
+    modules_toc = json.loads(r.text)
+
+    # modules_toc is a web based TOC, where as content_toc is file based
+    content_toc = {}
+
+    logging.debug("raw modules : %s" % [m['toc_title'] for m in modules_toc['items'][0]['children']])
+
+    # optional filter on selected module
+    modules = modules_toc['items'][0]['children']
+    if len(configuration.filter_modules):
+        modules = list(filter(lambda m: m['toc_title'].lower() in configuration.filter_modules, modules))
+        logging.debug("filtered modules : %s" % [m['toc_title'] for m in modules])
+
+    # Downloading modules contents
+    for module in modules:
+
+        module_name = module['toc_title']
+        module_uri = module.get("href")
+        module_cmdlets = module['children']
+        module_dir = os.path.join(download_dir, Configuration.base_url, module_name)
+
+        logging.info("[+] download module %s" % (module_name))
+        module_infos = download_module_contents(configuration, module_name, module_uri, module_dir,  module_cmdlets, download_dir)
+        content_toc[module_name] = module_infos
+
+    return content_toc
@@ -0,0 +1,294 @@
+""" Delta update archives between two docset builds """
+
+import os
+import io
+import json
+import time
+import shutil
+import logging
+import sqlite3
+import tarfile
+import hashlib
+import tempfile
+
+from .configuration import Configuration
+from .index import create_fulltext_table
+
+
+def hash_file(filepath : str):
+    """ Return the sha256 hex digest of a file's contents """
+
+    sha = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for data in iter(lambda: f.read(32*1024), b''):
+            sha.update(data)
+
+    return sha.hexdigest()
+
+def read_docset_index(sqlite_filepath : str):
+    """ Return the sorted (name, type, path) records of a docSet.dsidx database """
+
+    if not os.path.exists(sqlite_filepath):
+        return []
+
+    db = sqlite3.connect(sqlite_filepath)
+    records = db.execute('SELECT name, type, path FROM searchIndex').fetchall()
+    db.close()
+
+    return sorted([list(record) for record in records])
+
+def read_docset_fulltext(sqlite_filepath : str):
+    """ Return the 'searchText' full-text rows of a docSet.dsidx database keyed by path, or None if it has none """
+
+    if not os.path.exists(sqlite_filepath):
+        return None
+
+    db = sqlite3.connect(sqlite_filepath)
+    if db.execute("SELECT name FROM sqlite_master WHERE name = 'searchText'").fetchone() is None:
+        db.close()
+        return None
+
+    rows = db.execute('SELECT name, type, path, synopsis, parameters, text FROM searchText').fetchall()
+    db.close()
+
+    return { row[2] : list(row) for row in rows }
+
+def fulltext_digest(row : list):
+    """ Stable sha256 digest of a full-text row """
+
+    return hashlib.sha256(json.dumps(row).encode('utf8')).hexdigest()
+
+def create_docset_manifest(docset_dir : str):
+    """
+    Describe a built docset folder : a sha256 checksum for every file (keyed by its
+    unix-style path relative to the .docset folder), the records of the search index and
+    a sha256 checksum of every full-text row if the docset has a full-text index.
+    The docSet.dsidx database is not checksummed since its binary layout is not stable.
+    """
+
+    # """ Scheme for docset manifest :
+    # {
+    #     'files' : {
+    #         relative path : sha256,
+    #         ...
+    #     },
+    #     'index' : [
+    #         [name, type, path],
+    #         ...
+    #     ],
+    #     'fulltext' : { # optional
+    #         page path : sha256,
+    #         ...
+    #     }
+    # }
+    # """
+    files = {}
+
+    for root, _, filenames in os.walk(docset_dir):
+        for filename in filenames:
+
+            filepath = os.path.join(root, filename)
+            relpath = os.path.relpath(filepath, docset_dir).replace(os.sep, '/')
+            if relpath == Configuration.docset_index_path:
+                continue
+
+            files[relpath] = hash_file(filepath)
+
+    sqlite_filepath = os.path.join(docset_dir, Configuration.docset_index_path)
+    manifest = {
+        'files' : files,
+        'index' : read_docset_index(sqlite_filepath),
+    }
+
+    fulltext = read_docset_fulltext(sqlite_filepath)
+    if fulltext is not None:
+        manifest['fulltext'] = { path : fulltext_digest(row) for path, row in fulltext.items() }
+
+    return manifest
+
+def load_docset_manifest(path : str):
+    """ Load a docset manifest either from a built docset folder or from a json manifest """
+
+    if os.path.isdir(path):
+        return create_docset_manifest(path)
+
+    with open(path, "r") as content:
+        return json.load(content)
+
+def manifest_digest(manifest : dict):
+    """ Stable sha256 digest of a docset manifest """
+
+    serialized = json.dumps(manifest, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(serialized.encode('utf8')).hexdigest()
+
+def make_docset_delta(old_path : str, new_docset_dir : str, dst_filepath : str):
+    """
+    Create a delta archive between two docset builds. The tar-gz archive contains
+    'delta.json' (removed files, search index changes and the new manifest) and every
+    added or changed file under the 'files/' folder.
+    """
+
+    old_manifest = load_docset_manifest(old_path)
+    new_manifest = create_docset_manifest(new_docset_dir)
+
+    old_files, new_files = old_manifest['files'], new_manifest['files']
+    updated_files = sorted(path for path, sha in new_files.items() if old_files.get(path) != sha)
+    removed_files = sorted(path for path in old_files if path not in new_files)
+
+    old_index = set(map(tuple, old_manifest['index']))
+    new_index = set(map(tuple, new_manifest['index']))
+
+    # full-text rows are shipped whole, changed rows being removed then added back
+    old_fulltext = old_manifest.get('fulltext', {})
+    new_fulltext = new_manifest.get('fulltext', {})
+    updated_rows = sorted(path for path, sha in new_fulltext.items() if old_fulltext.get(path) != sha)
+    stale_rows = sorted(path for path, sha in old_fulltext.items() if new_fulltext.get(path) != sha)
+
+    fulltext = {}
+    if len(updated_rows):
+        fulltext = read_docset_fulltext(os.path.join(new_docset_dir, Configuration.docset_index_path))
+
+    delta = {
+        'format' : Configuration.delta_format_version,
+        'base' : manifest_digest(old_manifest),
+        'files' : updated_files,
+        'removed' : removed_files,
+        'index' : {
+            'added' : sorted(map(list, new_index - old_index)),
+            'removed' : sorted(map(list, old_index - new_index)),
+        },
+        'fulltext' : {
+            'added' : [fulltext[path] for path in updated_rows],
+            'removed' : stale_rows,
+        },
+        'manifest' : new_manifest,
+    }
+
+    logging.info("delta : %d files updated, %d files removed, %d index records added, %d index records removed, %d full-text rows added, %d full-text rows removed" % (
+        len(delta['files']), len(delta['removed']),
+        len(delta['index']['added']), len(delta['index']['removed']),
+        len(delta['fulltext']['added']), len(delta['fulltext']['removed'])
+    ))
+
+    dst_dir = os.path.dirname(os.path.realpath(dst_filepath))
+    os.makedirs(dst_dir, exist_ok=True)
+
+    with tarfile.open(dst_filepath, "w:gz") as tar:
+
+        delta_json = json.dumps(delta).encode('utf8')
+        delta_info = tarfile.TarInfo("delta.json")
+        delta_info.size = len(delta_json)
+        delta_info.mtime = time.time()
+        tar.addfile(delta_info, io.BytesIO(delta_json))
+
+        for path in updated_files:
+            logging.debug("delta add : %s" % path)
+            tar.add(os.path.join(new_docset_dir, path), arcname="files/%s" % path)
+
+    return delta
+
+def resolve_delta_path(docset_dir : str, path : str):
+    """ Return the full path of a file listed in a delta archive, refusing any path outside docset_dir """
+
+    docset_dir = os.path.realpath(docset_dir)
+    filepath = os.path.realpath(os.path.join(docset_dir, path))
+
+    if os.path.isabs(path) or os.path.commonpath([docset_dir, filepath]) != docset_dir or filepath == docset_dir:
+        raise ValueError("invalid path in delta archive : %s" % path)
+
+    return filepath
+
+def apply_docset_delta(old_docset_dir : str, delta_filepath : str, dst_docset_dir : str):
+    """
+    Rebuild the new docset folder from the old one and a delta archive, verifying checksums.
+    The docset is built in a temporary folder next to dst_docset_dir, and only moved into place once verified.
+    """
+
+    if os.path.exists(dst_docset_dir):
+        raise ValueError("%s already exists, the delta must be applied to a new folder" % dst_docset_dir)
+
+    dst_parent_dir = os.path.dirname(os.path.realpath(dst_docset_dir))
+    os.makedirs(dst_parent_dir, exist_ok = True)
+
+    tmp_dir = tempfile.mkdtemp(prefix = ".apply-delta-", dir = dst_parent_dir)
+    try:
+        build_dir = os.path.join(tmp_dir, os.path.basename(os.path.realpath(dst_docset_dir)))
+        delta = apply_docset_delta_to(old_docset_dir, delta_filepath, build_dir)
+        os.rename(build_dir, dst_docset_dir)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+    return delta
+
+def apply_docset_delta_to(old_docset_dir : str, delta_filepath : str, build_dir : str):
+    """ Rebuild the new docset in build_dir (which must not exist) and verify it against the delta manifest """
+
+    with tarfile.open(delta_filepath, "r:gz") as tar:
+
+        delta = json.load(tar.extractfile("delta.json"))
+        if delta['format'] != Configuration.delta_format_version:
+            raise ValueError("unsupported delta format : %s" % delta['format'])
+
+        # the delta can only be applied on the exact docset it was computed from
+        if manifest_digest(create_docset_manifest(old_docset_dir)) != delta['base']:
+            raise ValueError("%s does not match the delta base docset" % old_docset_dir)
+
+        shutil.copytree(old_docset_dir, build_dir)
+
+        # check every path before removing or writing anything
+        removed_filepaths = [resolve_delta_path(build_dir, path) for path in delta['removed']]
+        updated_filepaths = [resolve_delta_path(build_dir, path) for path in delta['files']]
+
+        for path, filepath in zip(delta['removed'], removed_filepaths):
+            logging.debug("delta remove : %s" % path)
+            os.remove(filepath)
+
+        for path, filepath in zip(delta['files'], updated_filepaths):
+            logging.debug("delta update : %s" % path)
+
+            os.makedirs(os.path.dirname(filepath), exist_ok = True)
+            with open(filepath, 'wb') as f:
+                shutil.copyfileobj(tar.extractfile("files/%s" % path), f)
+
+    # Update the search index in place
+    db = sqlite3.connect(os.path.join(build_dir, Configuration.docset_index_path))
+    cur = db.cursor()
+    cur.executemany('DELETE FROM searchIndex WHERE name = ? AND type = ? AND path = ?', delta['index']['removed'])
+    cur.executemany('INSERT INTO searchIndex(name, type, path) VALUES (?,?,?)', delta['index']['added'])
+
+    fulltext = delta.get('fulltext', { 'added' : [], 'removed' : []})
+    if len(fulltext['added']) and cur.execute("SELECT name FROM sqlite_master WHERE name = 'searchText'").fetchone() is None:
+        create_fulltext_table(cur)
+
+    # path is not indexed in the FTS table : look up the rowids in a single scan
+    if len(fulltext['removed']):
+        removed_paths = set(fulltext['removed'])
+        removed_rowids = [
+            (rowid,) for rowid, path in cur.execute('SELECT rowid, path FROM searchText').fetchall()
+            if path in removed_paths
+        ]
+        cur.executemany('DELETE FROM searchText WHERE rowid = ?', removed_rowids)
+    if len(fulltext['added']):
+        cur.executemany('INSERT INTO searchText(name, type, path, synopsis, parameters, text) VALUES (?,?,?,?,?,?)', fulltext['added'])
+
+    # the new docset was built without full-text index (e.g. sqlite lacking FTS5)
+    if 'fulltext' not in delta['manifest']:
+        cur.execute('DROP TABLE IF EXISTS searchText')
+    db.commit()
+    db.close()
+
+    # Verify the rebuilt docset against the new manifest
+    manifest = create_docset_manifest(build_dir)
+    expected = delta['manifest']
+
+    mismatches = sorted(
+        path for path in set(manifest['files']) | set(expected['files'])
+        if manifest['files'].get(path) != expected['files'].get(path)
+    )
+    if manifest['index'] != expected['index'] or manifest.get('fulltext') != expected.get('fulltext'):
+        mismatches.append(Configuration.docset_index_path)
+
+    if len(mismatches):
+        raise ValueError("checksum mismatch after applying delta : %s" % ", ".join(mismatches))
+
+    return delta
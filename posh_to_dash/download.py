@@ -0,0 +1,71 @@
+""" http(s) downloads, sharing a single retrying requests session """
+
+import os
+import gzip
+import time
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
+from requests.exceptions import ConnectionError
+
+
+# Global session for several retries
+session = requests.Session()
+retries = Retry(total=5, backoff_factor=1, status_forcelist=[ 502, 503, 504 ])
+session.mount('http://', HTTPAdapter(max_retries=retries))
+
+
+def download_binary(url, output_filename):
+    """ Download GET request as binary file """
+    global session
+    
+    logging.debug("download_binary : %s -> %s" % (url, output_filename))
+
+    # ensure the folder path actually exist
+    os.makedirs(os.path.dirname(output_filename), exist_ok = True)
+
+    r = session.get(url, stream=True)
+    with open(output_filename, 'wb') as f:
+        for data in r.iter_content(32*1024):
+            f.write(data)
+
+def download_textfile(url : str ,  output_filename : str, params : dict = None, compress : bool = False):
+    """ Download GET request as utf-8 text file, or stream it into a gzip-compressed "output_filename.gz" file """
+    global session
+
+    logging.debug("download_textfile : %s -> %s" % (url, output_filename))
+
+    # ensure the folder path actually exist
+    os.makedirs(os.path.dirname(output_filename), exist_ok = True)
+    
+    while True:
+        try:
+            r = session.get(url, data = params, stream = compress)
+        except ConnectionError:
+            logging.debug("caught ConnectionError, retrying...")
+            time.sleep(2)
+        else:
+            break
+    
+    if compress:
+        # decode as the response charset, without holding the whole response in memory :
+        # charset detection (r.apparent_encoding) would read the whole body, assume utf-8 instead
+        if r.encoding is None:
+            r.encoding = "utf8"
+
+        with gzip.open(output_filename + ".gz", 'wt', encoding="utf8", compresslevel=6) as f:
+            for data in r.iter_content(32*1024, decode_unicode=True):
+                f.write(data)
+
+        stale_filename = output_filename
+    else:
+        with open(output_filename, 'w', encoding="utf8") as f:
+            f.write(r.text)
+
+        stale_filename = output_filename + ".gz"
+
+    # do not keep a copy from a previous build using the other storage mode
+    if os.path.exists(stale_filename):
+        os.remove(stale_filename)
@@ -0,0 +1,53 @@
+import os
+import shutil
+
+
+def copy_folder(src_folder : str, dst_folder : str):
+    """ Copy a full folder tree anew every time """
+
+    def onerror(func, path, exc_info):
+        """
+        Error handler for ``shutil.rmtree``.
+
+        If the error is due to an access error (read only file)
+        it attempts to add write permission and then retries.
+
+        If the error is for another reason it re-raises the error.
+
+        Usage : ``shutil.rmtree(path, onerror=onerror)``
+        """
+        import stat
+
+        if not os.path.exists(path):
+            return
+
+        if not os.access(path, os.W_OK):
+            # Is the error an access error ?
+            os.chmod(path, stat.S_IWUSR)
+            func(path)
+        else:
+            raise
+
+    shutil.rmtree(dst_folder,ignore_errors=False,onerror=onerror) 
+    shutil.copytree(src_folder, dst_folder)
+
+def merge_folders(src, dst):
+    
+    if os.path.isdir(src):
+        
+        if not os.path.exists(dst):
+            os.makedirs(dst)
+        
+        for name in os.listdir(src):
+            merge_folders(
+                os.path.join(src, name),
+                os.path.join(dst, name)
+            )
+    else:
+        shutil.copyfile(src, dst)
+
+        # do not keep the copy of a page stored in the other compression mode
+        if dst.endswith(".html.gz") and os.path.exists(dst[:-len(".gz")]):
+            os.remove(dst[:-len(".gz")])
+        elif dst.endswith(".html") and os.path.exists(dst + ".gz"):
+            os.remove(dst + ".gz")
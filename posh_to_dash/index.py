@@ -0,0 +1,97 @@
+""" 4. Database indexing """
+
+import os
+import logging
+import sqlite3
+
+
+def create_sqlite_database(configuration, content_toc, resources_dir, documents_dir):
+    """ Indexing the html document in a format Dash can understand """
+
+    def insert_into_sqlite_db(cursor, name, record_type, path):
+        """ Insert a new unique record in the sqlite database. """
+        try:
+            cursor.execute('SELECT rowid FROM searchIndex WHERE path = ?', (path,))
+            dbpath = cursor.fetchone()
+            cursor.execute('SELECT rowid FROM searchIndex WHERE name = ?', (name,))
+            dbname = cursor.fetchone()
+
+            if dbpath is None and dbname is None:
+                cursor.execute('INSERT OR IGNORE INTO searchIndex(name, type, path) VALUES (?,?,?)', (name, record_type, path))
+                logging.debug('DB add [%s] >> name: %s, path: %s' % (record_type, name, path))
+            else:
+                logging.debug('record exists')
+
+        except:
+            pass
+
+    sqlite_filepath = os.path.join(resources_dir, "docSet.dsidx")
+    if os.path.exists(sqlite_filepath):
+        os.remove(sqlite_filepath)
+
+    db = sqlite3.connect(sqlite_filepath)
+    cur = db.cursor()
+    cur.execute('CREATE TABLE searchIndex(id INTEGER PRIMARY KEY, name TEXT, type TEXT, path TEXT);')
+    cur.execute('CREATE UNIQUE INDEX anchor ON searchIndex (name, type, path);')
+
+    
+    for module_name, module in content_toc.items():
+
+        # some modules do not have an index page
+        if module['index'] is not None:
+
+            # path should be unix compliant
+            module_path = module['index'].replace(os.sep, '/')
+            insert_into_sqlite_db(cur, module_name, "Module", module_path)
+
+        for cmdlet in module['cmdlets']:
+            
+            cmdlet_name = cmdlet['name']
+            if cmdlet_name == module_name:
+                continue
+
+            # path should be unix compliant
+            cmdlet_path = cmdlet['path'].replace(os.sep, '/')
+
+            insert_into_sqlite_db(cur, cmdlet_name, "Command", cmdlet_path)
+        
+
+    # commit and close db
+    db.commit()
+    db.close()
+
+def create_fulltext_table(cursor):
+    """ Create the 'searchText' FTS5 table. Raises sqlite3.OperationalError if sqlite lacks FTS5 """
+
+    cursor.execute('CREATE VIRTUAL TABLE searchText USING fts5(name, type UNINDEXED, path UNINDEXED, synopsis, parameters, text);')
+
+def create_fulltext_index(sqlite_filepath : str, pages_text : dict):
+    """
+    Bulk insert the synopsis, parameters names and text of every indexed page
+    in a 'searchText' FTS5 table, next to Dash's 'searchIndex' table.
+    """
+
+    db = sqlite3.connect(sqlite_filepath)
+    cur = db.cursor()
+
+    try:
+        create_fulltext_table(cur)
+    except sqlite3.OperationalError as e:
+        # sqlite may be compiled without FTS5 : the docset is still usable by Dash
+        logging.warning("full-text index not created : %s" % e)
+        db.close()
+        return
+
+    records = cur.execute('SELECT name, type, path FROM searchIndex').fetchall()
+    rows = (
+        (name, record_type, path, pages_text[path].synopsis, pages_text[path].parameters, pages_text[path].text)
+        for name, record_type, path in records
+        if path in pages_text
+    )
+    cur.executemany('INSERT INTO searchText(name, type, path, synopsis, parameters, text) VALUES (?,?,?,?,?,?)', rows)
+
+    # merge the index b-trees once everything is inserted, for faster queries
+    cur.execute("INSERT INTO searchText(searchText) VALUES ('optimize')")
+
+    db.commit()
+    db.close()
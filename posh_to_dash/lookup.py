@@ -0,0 +1,278 @@
+"""
+Offline lookup over the search index of a built Powershell docset.
+
+The docSet.dsidx 'searchIndex' table is loaded once in memory, along with
+a sorted prefix index and a trigram index, in order to serve prefix,
+substring and fuzzy queries on module and cmdlet names :
+
+    lookup = DocsetLookup.open("Powershell.tgz")
+    for record in lookup.fuzzy("get-chlditem"):
+        print(record.name, record.path)
+
+Ranked full-text queries on pages synopsis, parameters and text are served
+by the 'searchText' FTS5 table, when the docset has one :
+
+    for record in lookup.fulltext("remote computer credential"):
+        print(record.name, record.path, record.snippet)
+"""
+
+import os
+import bisect
+import shutil
+import sqlite3
+import tarfile
+import tempfile
+import time
+import difflib
+import statistics
+import collections
+import itertools
+
+LookupRecord = collections.namedtuple('LookupRecord', 'name, type, path')
+FullTextRecord = collections.namedtuple('FullTextRecord', 'name, type, path, snippet, rank')
+
+# Representative queries used by the lookup benchmark
+benchmark_queries = {
+    'prefix' : ["get-", "set-ch", "new-item", "invoke-web", "microsoft.powershell"],
+    'substring' : ["item", "childitem", "process", "service", "-az"],
+    'fuzzy' : ["get-chlditem", "invok-webrequest", "stop-proces", "get-servce", "microsoft.powershel.utility"],
+    'fulltext' : ["computername", "remote session", "credential", "registry key", "firewall rule"],
+}
+
+
+def trigrams(text : str, padded : bool = False):
+    """ Return the set of trigrams of a lowercased string, optionally padded for fuzzy matching """
+
+    if padded:
+        text = "  %s " % text
+    return set(text[i:i+3] for i in range(len(text) - 2))
+
+
+class DocsetLookup:
+    """ In-memory prefix/trigram index over docset search records """
+
+    # bm25 weights of the searchText columns : name, type, path, synopsis, parameters, text
+    fulltext_weights = (10.0, 0.0, 0.0, 5.0, 5.0, 1.0)
+
+    def __init__(self, records, db = None, tmp_dir = None):
+
+        # docSet.dsidx connection, only kept for full-text queries, and the
+        # temporary folder holding the index extracted from a .tgz archive
+        self.db = db
+        self.tmp_dir = tmp_dir
+
+        # records sorted by lowercased name, so the prefix index maps directly on it
+        self.records = sorted(
+            (LookupRecord(*record) for record in records),
+            key = lambda record: (record.name.lower(), record.type, record.path)
+        )
+        self.names = [record.name.lower() for record in self.records]
+
+        # trigram -> ids of records containing it (padded trigrams are a superset of the inner ones)
+        self.trigram_index = collections.defaultdict(set)
+        for record_id, name in enumerate(self.names):
+            for trigram in trigrams(name, padded = True):
+                self.trigram_index[trigram].add(record_id)
+
+    @classmethod
+    def open(cls, path : str):
+        """ Load the search index from a .docset folder, a docSet.dsidx file or a docset .tgz archive """
+
+        db, tmp_dir = connect_index(path)
+
+        try:
+            records = db.execute('SELECT name, type, path FROM searchIndex').fetchall()
+            has_fulltext = db.execute("SELECT name FROM sqlite_master WHERE name = 'searchText'").fetchone() is not None
+        except sqlite3.DatabaseError as e:
+            db.close()
+            if tmp_dir is not None:
+                tmp_dir.cleanup()
+            raise ValueError("%s is not a docset index : %s" % (path, e))
+
+        lookup = cls(records, db = db, tmp_dir = tmp_dir)
+
+        # the connection is only needed for full-text queries
+        if not has_fulltext:
+            lookup.close()
+
+        return lookup
+
+    def close(self):
+        """ Close the docSet.dsidx connection used by full-text queries, and remove the extracted index if any """
+
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+        if self.tmp_dir is not None:
+            self.tmp_dir.cleanup()
+            self.tmp_dir = None
+
+    def _filter(self, record_ids, record_type : str):
+        """ yield records from ids, optionally restricted to a record type ("Module", "Command") """
+
+        for record_id in record_ids:
+            record = self.records[record_id]
+            if record_type is None or record.type == record_type:
+                yield record
+
+    def prefix(self, query : str, record_type : str = None, limit : int = 20):
+        """ Records whose name starts with query, in alphabetical order """
+
+        query = query.lower()
+        start = bisect.bisect_left(self.names, query)
+        end = bisect.bisect_right(self.names, query + '\uffff', lo = start)
+
+        return list(itertools.islice(self._filter(range(start, end), record_type), limit))
+
+    def substring(self, query : str, record_type : str = None, limit : int = 20):
+        """ Records whose name contains query, earliest and shortest matches first """
+
+        query = query.lower()
+        query_trigrams = trigrams(query)
+
+        if len(query_trigrams):
+            # only verify the records sharing every trigram of the query
+            postings = sorted((self.trigram_index.get(t, set()) for t in query_trigrams), key = len)
+            candidates = set.intersection(*postings)
+        else:
+            candidates = range(len(self.names))
+
+        matches = [record_id for record_id in candidates if query in self.names[record_id]]
+        matches.sort(key = lambda record_id: (
+            self.names[record_id].index(query),
+            len(self.names[record_id]),
+            self.names[record_id]
+        ))
+
+        return list(itertools.islice(self._filter(matches, record_type), limit))
+
+    def fuzzy(self, query : str, record_type : str = None, limit : int = 20, candidates : int = 200, cutoff : float = 0.6):
+        """ Records whose name similarity ratio with query is at least cutoff, best matches first """
+
+        query = query.lower()
+
+        # shortlist records sharing the most trigrams with the query ...
+        shared = collections.Counter()
+        for trigram in trigrams(query, padded = True):
+            shared.update(self.trigram_index.get(trigram, ()))
+
+        shortlist = [record_id for record_id, _ in shared.most_common(candidates)]
+
+        # ... and rank them by edit similarity
+        matcher = difflib.SequenceMatcher(b = query)
+        scores = {}
+        for record_id in shortlist:
+            matcher.set_seq1(self.names[record_id])
+            scores[record_id] = matcher.ratio()
+
+        shortlist = [record_id for record_id in shortlist if scores[record_id] >= cutoff]
+        shortlist.sort(key = lambda record_id: (-scores[record_id], self.names[record_id]))
+
+        return list(itertools.islice(self._filter(shortlist, record_type), limit))
+
+    def fulltext(self, query : str, record_type : str = None, limit : int = 20):
+        """ Pages whose name, synopsis, parameters or text contain every query term, best ranked first """
+
+        if self.db is None:
+            raise ValueError("this docset has no full-text index")
+
+        # quote every term, so cmdlets and parameters names are not parsed as FTS5 operators
+        terms = ['"%s"' % term.replace('"', '""') for term in query.split()]
+        if not len(terms):
+            return []
+
+        sql = (
+            "SELECT name, type, path, snippet(searchText, 5, '[', ']', '...', 12), bm25(searchText, ?, ?, ?, ?, ?, ?) AS rank "
+            "FROM searchText WHERE searchText MATCH ?"
+        )
+        params = list(self.fulltext_weights) + [" ".join(terms)]
+
+        if record_type is not None:
+            sql += " AND type = ?"
+            params.append(record_type)
+
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+
+        return [FullTextRecord(*row) for row in self.db.execute(sql, params)]
+
+    def search(self, query : str, mode : str = 'prefix', record_type : str = None, limit : int = 20):
+        """ Dispatch a query on one of the 'prefix', 'substring', 'fuzzy' or 'fulltext' lookup modes """
+
+        modes = {
+            'prefix' : self.prefix,
+            'substring' : self.substring,
+            'fuzzy' : self.fuzzy,
+            'fulltext' : self.fulltext,
+        }
+        if mode not in modes:
+            raise ValueError("unknown lookup mode : %s" % mode)
+
+        return modes[mode](query, record_type = record_type, limit = limit)
+
+
+def connect_index(path : str):
+    """
+    Open the docSet.dsidx database of a .docset folder, a docSet.dsidx file or a docset .tgz archive.
+    Returns the connection and, for archives, the temporary folder the index was extracted to (to be
+    cleaned up once the connection is closed), otherwise None.
+    """
+
+    if os.path.isdir(path):
+        path = os.path.join(path, "Contents", "Resources", "docSet.dsidx")
+
+    if not os.path.isfile(path):
+        raise ValueError("docset index not found : %s" % path)
+
+    if not tarfile.is_tarfile(path):
+        return sqlite3.connect(path), None
+
+    # sqlite can only open files on disk : extract the index in a temporary folder
+    with tarfile.open(path, "r:*") as tar:
+
+        members = [m for m in tar.getmembers() if m.name.endswith("Contents/Resources/docSet.dsidx")]
+        if not len(members):
+            raise ValueError("no docSet.dsidx found in %s" % path)
+
+        tmp_dir = tempfile.TemporaryDirectory()
+        sqlite_filepath = os.path.join(tmp_dir.name, "docSet.dsidx")
+        with open(sqlite_filepath, 'wb') as f:
+            shutil.copyfileobj(tar.extractfile(members[0]), f)
+
+    return sqlite3.connect(sqlite_filepath), tmp_dir
+
+
+def benchmark(path : str, queries : dict = benchmark_queries, repeat : int = 100):
+    """
+    Measure the index load time, the per-query latency and the throughput of each lookup mode.
+    Returns { 'load' : seconds, 'records' : int, mode : { 'median' : seconds, 'max' : seconds, 'throughput' : queries per second }, ... }
+    The 'fulltext' mode is skipped when the docset has no full-text index.
+    """
+
+    start = time.perf_counter()
+    lookup = DocsetLookup.open(path)
+    results = { 'load' : time.perf_counter() - start, 'records' : len(lookup.records) }
+
+    try:
+        for mode, mode_queries in queries.items():
+
+            if mode == 'fulltext' and lookup.db is None:
+                continue
+
+            latencies = []
+            for query in mode_queries:
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    lookup.search(query, mode = mode)
+                    latencies.append(time.perf_counter() - start)
+
+            results[mode] = {
+                'median' : statistics.median(latencies),
+                'max' : max(latencies),
+                'throughput' : len(latencies) / sum(latencies),
+            }
+    finally:
+        lookup.close()
+
+    return results
@@ -0,0 +1,121 @@
+""" 3. Download additionnal resources """
+
+import os
+import re
+import logging
+
+from bs4 import BeautifulSoup as bs, Tag # pip install bs4
+
+from .configuration import Configuration
+from .download import download_binary, download_textfile
+
+
+def rewrite_index_soup(configuration : Configuration, soup, index_html_path : str, documents_dir : str):
+    """ rewrite html contents by fixing links and remove unnecessary cruft """
+
+    # Fix navigations links
+    content_tables = soup.findAll("table", { 
+        "class" : "api-search-results"
+    })
+
+    for content_table in content_tables:
+
+        links = content_table.findAll(lambda tag: tag.name == 'a')
+        link_pattern = re.compile(r"/powershell/module/([\w\.\-]+)/\?view=powershell-")
+
+        for link in links:
+
+            href = link['href']
+            fixed_href = href
+
+
+            targets = link_pattern.findall(href)
+            if not len(targets): 
+                continue # badly formated 'a' link
+
+            module_name = targets[0].lstrip('/').rstrip('/')
+            fixed_href = "powershell/module/%s/%s.html" % (module_name, module_name)
+            
+            if fixed_href != href:
+                logging.debug("link rewrite : %s -> %s " % ( href, fixed_href))
+                link['href'] = fixed_href
+
+        # Fix link to module.svg
+        module_svg_path = os.path.join(documents_dir, Configuration.domain, "en-us", "media", "toolbars", "module.svg")
+        images = content_table.findAll("img" , {'alt' : "Module"})
+        for image in images:
+            image['src'] =  os.path.relpath(module_svg_path, os.path.dirname(index_html_path))
+
+    # remove unsupported nav elements
+    nav_elements = [
+        ["nav"  , { "class" : "doc-outline", "role" : "navigation"}],
+        ["ul"   , { "class" : "breadcrumbs", "role" : "navigation"}],
+        ["div"  , { "class" : "sidebar", "role" : "navigation"}],
+        ["div"  , { "class" : "dropdown dropdown-full mobilenavi"}],
+        ["p"    , { "class" : "api-browser-description"}],
+        ["div"  , { "class" : "api-browser-search-field-container"}],
+        ["div"  , { "class" : "pageActions"}],
+        ["div"  , { "class" : "dropdown-container"}],
+        ["div"  , { "class" : "container footerContainer"}],
+        ["div"  , { "data-bi-name" : "header", "id" : "headerAreaHolder"}],
+    ]
+
+    for nav in nav_elements:
+        nav_class, nav_attr = nav
+        
+        for nav_tag in soup.findAll(nav_class, nav_attr):
+            _ = nav_tag.extract()
+
+    # remove script elems
+    for head_script in soup.head.findAll("script"):
+            _ = head_script.extract()
+    for body_async_script in soup.body.findAll("script", { "async" : "",  "defer" : ""}):
+            _ = head_script.extract()
+
+    # Fixing and downloading css stylesheets
+    theme_output_dir = os.path.join(documents_dir, Configuration.domain)
+    for link in soup.head.findAll("link", { "rel" : "stylesheet"}):
+        uri_path = link['href'].strip()
+
+        if not uri_path.lstrip('/').startswith(Configuration.default_theme_uri):
+            continue
+
+        # Construct (url, path) tuple
+        css_url = "https://%s/%s" % (Configuration.domain, uri_path)
+        css_filepath =  os.path.join(theme_output_dir, uri_path.lstrip('/'))
+
+        # Converting href to a relative link
+        path = os.path.relpath(css_filepath, os.path.dirname(index_html_path))
+        rel_uri = '/'.join(path.split(os.sep))
+        link['href'] = rel_uri
+
+        download_textfile(css_url, css_filepath)
+
+    return soup
+
+
+def download_additional_resources(configuration : Configuration, documents_dir : str, resources_to_dl : set = set()):
+    """ Download optional resources for "beautification """
+
+    for resource in resources_to_dl:
+        
+        download_textfile(
+            resource.url, 
+            os.path.join(documents_dir, resource.path)
+        )
+
+    # Download index start page
+    index_url = Configuration.default_url % configuration.powershell_version
+    index_filepath = os.path.join(documents_dir, Configuration.domain, "en-us", "index.html")
+
+    soup = bs( configuration.webdriver.get_url_page(index_url), 'html.parser')
+    soup = rewrite_index_soup(configuration, soup, index_filepath, documents_dir)
+    fixed_html = soup.prettify("utf-8")
+    with open(index_filepath, 'wb') as o_fd:
+            o_fd.write(fixed_html)
+
+
+    # Download module.svg icon for start page
+    icon_module_url  =     '/'.join(["https:/"   , Configuration.domain, "en-us", "media", "toolbars", "module.svg"])
+    icon_module_path = os.path.join(documents_dir, Configuration.domain, "en-us", "media", "toolbars", "module.svg")
+    download_binary(icon_module_url, icon_module_path)
@@ -0,0 +1,178 @@
+""" 2. Parse and rewrite html contents """
+
+import os
+import re
+import glob
+import gzip
+import logging
+import collections
+
+from bs4 import BeautifulSoup as bs, Tag # pip install bs4
+
+from .configuration import Configuration
+
+# Searchable text of a page, extracted while rewriting it
+PageTextRecord = collections.namedtuple('PageTextRecord', 'synopsis, parameters, text')
+
+
+def rewrite_soup(configuration : Configuration, soup, html_path : str, documents_dir : str):
+    """ rewrite html contents by fixing links and remove unnecessary cruft, and extract the page searchable text """
+
+    # Fix navigations links
+    links = soup.findAll("a", { "data-linktype" : "relative-path"}) # for modules and cmdlet pages
+    link_pattern = re.compile(r"([\w\.\/-]+)\?view=[powershell-|win10-ps]")
+
+    for link in links:
+
+        href = link['href']
+        fixed_href = href
+
+        # go back to module
+        if href == "./?view=powershell-%s" % configuration.powershell_version:
+            fixed_href = "./%s.html" % link.text
+
+        # go to a cmdlet page
+        else:
+            targets = link_pattern.findall(href)
+            if not len(targets): # badly formated 'a' link
+                continue
+
+            module_name = targets[0]
+            fixed_href = "%s.html" % module_name
+        
+        if fixed_href != href:
+            logging.debug("link rewrite : %s -> %s " % ( href, fixed_href))
+            link['href'] = fixed_href
+
+    # remove unsupported nav elements
+    nav_elements = [
+        ["nav"  , { "class" : "doc-outline", "role" : "navigation"}],
+        ["ul"   , { "class" : "breadcrumbs", "role" : "navigation"}],
+        ["div"  , { "class" : "sidebar", "role" : "navigation"}],
+        ["div"  , { "class" : "dropdown dropdown-full mobilenavi"}],
+        ["p"    , { "class" : "api-browser-description"}],
+        ["div"  , { "class" : "api-browser-search-field-container"}],
+        ["div"  , { "class" : "pageActions"}],
+        ["div"  , { "class" : "container footerContainer"}],
+        ["div"  , { "class" : "dropdown-container"}],
+    ]
+
+    for nav in nav_elements:
+        nav_class, nav_attr = nav
+        
+        for nav_tag in soup.findAll(nav_class, nav_attr):
+            _ = nav_tag.extract()
+
+    # remove script elems
+    for head_script in soup.head.findAll("script"):
+            _ = head_script.extract()
+    
+    # Extract and rewrite additionnal stylesheets to download
+    ThemeResourceRecord = collections.namedtuple('ThemeResourceRecord', 'url, path')
+
+    theme_output_dir = os.path.join(documents_dir, Configuration.domain)
+    theme_resources = []
+
+    for link in soup.head.findAll("link", { "rel" : "stylesheet"}):
+        uri_path = link['href'].strip()
+
+        if not uri_path.lstrip('/').startswith(Configuration.default_theme_uri):
+            continue
+
+        # Construct (url, path) tuple
+        css_url = "https://%s/%s" % (Configuration.domain, uri_path)
+        css_filepath =  os.path.join(theme_output_dir, uri_path.lstrip('/'))
+
+        # Converting href to a relative link
+        path = os.path.relpath(css_filepath, os.path.dirname(html_path))
+        rel_uri = '/'.join(path.split(os.sep))
+        link['href'] = rel_uri
+
+        theme_resources.append( ThemeResourceRecord( 
+            url = css_url, 
+            path = os.path.relpath(css_filepath, documents_dir), # stored as relative path
+        ))
+
+    return soup, set(theme_resources), extract_page_text(soup)
+
+
+def extract_page_text(soup):
+    """ extract the synopsis, parameters names and cleaned text of an already rewritten page """
+
+    content = soup.find("main") or soup.body
+    if content is None:
+        return PageTextRecord(synopsis = "", parameters = "", text = "")
+
+    # cmdlet pages : "Synopsis" section, otherwise the first paragraph after the title
+    synopsis = ""
+    synopsis_header = content.find(["h2", "h3"], { "id" : "synopsis"})
+    title = content.find("h1")
+    first_paragraph = (synopsis_header or title or content).find_next("p")
+    if first_paragraph:
+        synopsis = first_paragraph.get_text(" ", strip = True)
+
+    # parameters sections are titled (and id'ed) by the parameter name : "-Path", "-Force", etc.
+    parameters = [
+        header.get_text(strip = True).lstrip('-')
+        for header in content.findAll("h3", { "id" : re.compile(r"^-")})
+    ]
+
+    return PageTextRecord(
+        synopsis = synopsis,
+        parameters = " ".join(parameters),
+        text = content.get_text(" ", strip = True),
+    )
+
+
+def rewrite_html_contents(configuration : Configuration, html_root_dir : str):
+    """ rewrite every html file downloaded, returning the resources to download and every page text """
+
+    additional_resources = set()
+    pages_text = {}
+
+    html_files = glob.glob("%s/**/*.html" % html_root_dir, recursive = True)
+    compressed_html_files = glob.glob("%s/**/*.html.gz" % html_root_dir, recursive = True)
+
+    # a page stored both compressed and uncompressed is only read from the newest file
+    page_files = { html_file : html_file for html_file in html_files }
+    for compressed_html_file in compressed_html_files:
+        html_file = compressed_html_file[:-len(".gz")]
+        if html_file not in page_files:
+            page_files[html_file] = compressed_html_file
+        elif os.path.getmtime(compressed_html_file) > os.path.getmtime(html_file):
+            page_files[html_file] = compressed_html_file
+            os.remove(html_file)
+        else:
+            os.remove(compressed_html_file)
+
+    for html_file in page_files.values():
+
+        logging.debug("rewrite  html_file : %s" % (html_file))
+
+        # Read content and parse html, compressed pages being decompressed on the fly
+        if html_file.endswith(".gz"):
+            with gzip.open(html_file, 'rt', encoding='utf8') as i_fd:
+                html_content = i_fd.read()
+
+            # rewritten pages are always exported uncompressed
+            os.remove(html_file)
+            html_file = html_file[:-len(".gz")]
+        else:
+            with open(html_file, 'r', encoding='utf8') as i_fd:
+                html_content = i_fd.read()
+
+        soup = bs(html_content, 'html.parser')
+        
+        # rewrite html
+        soup, resources, page_text = rewrite_soup(configuration, soup, html_file, html_root_dir)
+        additional_resources = additional_resources.union(resources)
+
+        # keyed by the unix-style path stored in the search index
+        pages_text[os.path.relpath(html_file, html_root_dir).replace(os.sep, '/')] = page_text
+
+        # Export fixed html
+        fixed_html = soup.prettify("utf-8")
+        with open(html_file, 'wb') as o_fd:
+            o_fd.write(fixed_html)
+
+    return additional_resources, pages_text
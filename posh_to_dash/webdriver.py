@@ -0,0 +1,62 @@
+""" Selenium webdriver wrapper, only used to render javascript-generated pages """
+
+import time
+import urllib.error
+
+from selenium import webdriver
+from selenium.webdriver import Firefox
+from selenium.webdriver.firefox.options import Options
+from selenium.webdriver.firefox.firefox_binary import FirefoxBinary
+
+
+class PoshWebDriver:
+    """ Thin wrapper for selenium webdriver for page content retrieval """
+
+    def __init__(self, executable_path = None):
+
+        options = Options()
+        options.add_argument('-headless')
+
+        self.driver_exe_path = executable_path
+
+        if self.driver_exe_path:
+            binary = FirefoxBinary(executable_path)
+            self.driver = webdriver.Firefox(
+                firefox_binary=binary,
+                options=options,
+            )
+        else:
+            self.driver = webdriver.Firefox(
+                options=options
+            )
+
+    def get_url_page(self, url):
+        """ retrieve the full html content of a page after Javascript execution """
+        
+        index_html = None
+        try:
+            self.driver.get(url)
+            index_html = self.driver.page_source
+        except (ConnectionResetError, urllib.error.URLError) as e:
+            # we may have a triggered a anti-scraping time ban
+            # Lay low for several seconds and get back to it.
+
+            self.driver.quit()
+            time.sleep(2)
+            
+            if self.driver_exe_path:
+                self.driver = webdriver.PhantomJS(executable_path = self.driver_exe_path)
+            else:
+                self.driver = webdriver.PhantomJS()
+                
+            index_html = None
+
+        # try a second time, and raise error if fail
+        if not index_html:
+            self.driver.get(url)
+            index_html = self.driver.page_source
+
+        return index_html
+
+    def quit():
+        return self.driver.quit()